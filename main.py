@@ -18,7 +18,8 @@ logging.basicConfig(level=os.environ.get("LOGLEVEL", "WARNING"))
 
 def generate_schema(input_file, include_text, skip_cols,
         max_categorical, num_bins, include_na,
-        categorical_cols, geographical_cols):
+        categorical_cols, geographical_cols, chunksize=None,
+        engine=schemagen.DEFAULT_CSV_ENGINE):
   # Create a SchemaGenerator
   local_schema_generator = schemagen.SchemaGenerator()
 
@@ -31,7 +32,9 @@ def generate_schema(input_file, include_text, skip_cols,
       num_bins=num_bins,
       include_na=include_na,
       categorical_columns=categorical_cols,
-      geographical_columns=geographical_cols
+      geographical_columns=geographical_cols,
+      chunksize=chunksize,
+      engine=engine
   )
 
   # If the loading was unsuccessful, exit
@@ -42,6 +45,27 @@ def generate_schema(input_file, include_text, skip_cols,
   return local_schema_generator
 
 def output_schema(param_schema_generator, output_dir):
+  # Validate the in-memory schema objects before writing anything out;
+  # this skips re-reading and re-parsing the files just to validate them
+  logging.info("Done generating schema. Validating generated schema...")
+  try:
+    validate.validate_schema_obj(
+        param_schema_generator.get_parameters_json(), True)
+  except: # Logging the full exception... pylint: disable=bare-except
+    logging.exception("Caught an error when trying to validate the \
+generated parameters schema")
+    logging.warning("The parameters.json file should be reviewed to ensure \
+it is complete.")
+
+  try:
+    validate.validate_schema_obj(
+        param_schema_generator.get_column_datatypes_json(), False)
+  except: # Logging the full exception... pylint: disable=bare-except
+    logging.exception("Caught an error when trying to validate the \
+generated column datatypes")
+    logging.warning("The column_datatypes.json file should be reviewed \
+manually to ensure it is complete.")
+
   # Output the parameters.json file to the output directory (if specified)
   output_parameters_json = param_schema_generator.output_parameters_json(
       output_directory = output_dir
@@ -51,24 +75,6 @@ def output_schema(param_schema_generator, output_dir):
           output_directory = output_dir
       )
 
-  # Validate the output schema
-  logging.info("Done generating schema. Validating output files...")
-  try:
-    validate.validate_schema(output_parameters_json, True)
-  except: # Logging the full exception... pylint: disable=bare-except
-    logging.exception("Caught an error when trying to validate %s",
-        output_parameters_json)
-    logging.warning("%s file should be reviewed to ensure it is complete.",
-        output_parameters_json)
-
-  try:
-    validate.validate_schema(output_column_datatypes_json, False)
-  except: # Logging the full exception... pylint: disable=bare-except
-    logging.exception("Caught an error when trying to validate %s",
-        output_column_datatypes_json)
-    logging.warning("%s should be reviewed manually to ensure it is complete.",
-        output_column_datatypes_json)
-
   print("\nSchema generator is complete! Schema files are:")
   print(output_parameters_json)
   print(output_column_datatypes_json)
@@ -122,6 +128,21 @@ if __name__ == "__main__":
     str(schemagen.DEFAULT_INCLUDE_NA),
     default=schemagen.DEFAULT_INCLUDE_NA, action="store_true")
 
+  parser.add_argument("-e", "--engine", help=
+    "The engine to use for reading the input file. The 'polars' and \
+    'pyarrow' engines use multi-threaded CSV parsers that can be several \
+    times faster on large files, but require the relevant package to be \
+    installed (if it isn't, the default engine is used). Defaults to " +
+    str(schemagen.DEFAULT_CSV_ENGINE),
+    choices=["pandas", "polars", "pyarrow"],
+    default=schemagen.DEFAULT_CSV_ENGINE, type=str)
+
+  parser.add_argument("-z", "--chunksize", help=
+    "Read the input file this many rows at a time, instead of all at \
+    once. This keeps memory usage bounded regardless of the number of \
+    rows in the file, at some cost in processing time. By default the \
+    whole file is read into memory.", default=None, type=int)
+
   parser.add_argument("-t", "--include_text_columns", help=
     "Specify this to include columns that are type 'text' (non-categorical \
     string columns). Defaults to " +
@@ -153,7 +174,8 @@ if __name__ == "__main__":
   schema_generator = generate_schema(args.inputfile,
           args.include_text_columns, skip_columns,
           args.max_categorical, args.num_bins,  args.include_na,
-          categorical_columns, geographical_columns)
+          categorical_columns, geographical_columns,
+          chunksize=args.chunksize, engine=args.engine)
 
   # The schema wasn't able to be generated
   if not schema_generator:
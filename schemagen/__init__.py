@@ -24,3 +24,4 @@ from .schemagen import DEFAULT_MAX_VALUES_FOR_CATEGORICAL
 from .schemagen import DEFAULT_NUM_BINS
 from .schemagen import DEFAULT_INCLUDE_NA
 from .schemagen import DEFAULT_INCLUDE_TEXT
+from .schemagen import DEFAULT_CSV_ENGINE
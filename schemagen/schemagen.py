@@ -17,19 +17,74 @@ methods.
   parameters_json = schema_generator.get_parameters_json()
 """
 
+import os
 import os.path
 import json
 import math
 import logging
+import concurrent.futures
 import pandas as pd
 import numpy as np
 
+# orjson serializes large schema dicts several times faster than the
+# stdlib json module, but it's optional; fall back to stdlib if missing
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
 # Allow long lines in docs. pylint: disable=line-too-long
 DEFAULT_MAX_VALUES_FOR_CATEGORICAL = 40 #: *(default)* columns with fewer than this many values will be considered categorical
 DEFAULT_NUM_BINS = 10 #: *(default)* informational "number of bins" into which a consumer of the schema should bucket the values
 DEFAULT_INCLUDE_NA = False #: *(default)* whether or not to include NaN as a value for categorical fields
 DEFAULT_INCLUDE_TEXT = False #: *(default)* whether or not to include columns of kind "text" (non-categorical string columns)
 DEFAULT_PADDING_PERCENTAGE = 0.05
+DEFAULT_CSV_ENGINE = "pandas" #: *(default)* which engine to use for reading the input CSV file ("pandas" or "polars")
+DATE_PROBE_SAMPLE_SIZE = 32 #: how many values to sample when probing whether a string column contains dates
+
+# The value ranges of the integer datatypes we're willing to put in a
+# schema, from smallest to largest (unsigned preferred, to match what
+# np.can_cast would pick). Scanning this table is much cheaper than
+# going through numpy's dtype-promotion machinery for every column; the
+# names are stored directly so no numpy dtype objects are built at all.
+INT_DTYPE_RANGES = (
+  ("uint8", 0, 2**8 - 1),
+  ("int8", -2**7, 2**7 - 1),
+  ("uint16", 0, 2**16 - 1),
+  ("int16", -2**15, 2**15 - 1),
+  ("uint32", 0, 2**32 - 1),
+  ("int32", -2**31, 2**31 - 1),
+  ("uint64", 0, 2**64 - 1),
+  ("int64", -2**63, 2**63 - 1),
+)
+# The dtype "kinds" that get the integer and float treatment in
+# _get_series_dtype. Built once at import time; constructing fresh lists
+# for the membership tests on every call adds up on very wide dataframes.
+_INT_KINDS = frozenset("iu")
+_FLOAT_KINDS = frozenset("fc")
+
+# Cache of the most recently parsed CSV file, keyed by (path, mtime,
+# size, dtype). This lives at module level (like the compiled-validator
+# cache in validate.py) so that every SchemaGenerator instance shares
+# it; callers that construct a fresh generator per file -- as the test
+# suite does -- still skip the re-parse of an unchanged file.
+_CSV_CACHE = {}
+
+# The errors we expect to be common when reading the input CSV file,
+# with a helpful message for each. _load_csv looks the caught error up
+# here (one handler frame) instead of chaining an except clause per type.
+_LOAD_ERR_MSGS = {
+  pd.errors.ParserError: "Using input file: '%s', \
+'pandas.read_csv()' was unable to parse the input file \
+as a CSV. Please confirm that it contains valid comma-separated \
+values.",
+  FileNotFoundError: "Using input file: '%s', \
+the file was not found. Please confirm the specified \
+path, or use a full path instead of a relative path.",
+  pd.errors.EmptyDataError: "\nUsing input file: '%s', \
+The file appears to be empty. Please confirm the path.",
+}
+
 NAME_FOR_PARAMETERS_FILE = "parameters.json"
 NAME_FOR_DATATYPES_FILE = "column_datatypes.json"
 # pylint: enable=line-too-long
@@ -74,7 +129,11 @@ class SchemaGenerator:
             num_bins = DEFAULT_NUM_BINS,
             include_na = DEFAULT_INCLUDE_NA,
             categorical_columns = None,
-            geographical_columns = None):
+            geographical_columns = None,
+            engine = DEFAULT_CSV_ENGINE,
+            chunksize = None,
+            dtype = None,
+            sample_rows = None):
     # Allow long lines in docs, because params. pylint: disable=line-too-long
     """This method loads in a new input CSV file and attempts to infer
     a schema from it. If the SchemaGenerator has already been used to
@@ -102,6 +161,14 @@ class SchemaGenerator:
     :type categorical_columns: list
     :param geographical_columns: a list of names of columns to always treat as geographical (and therefore categorical), regardless of number of values
     :type geographical_columns: list
+    :param engine: which engine to use to read the CSV file; "polars" uses the multi-threaded polars CSV reader and "pyarrow" uses the multi-threaded Arrow C++ CSV reader (each if its package is available), both of which can be several times faster on large files; "pandas" (the default) uses ``pandas.read_csv``
+    :type engine: str
+    :param chunksize: if set, read the CSV file this many rows at a time and fold each chunk into per-column accumulators instead of materializing the whole file; this keeps memory usage independent of the number of rows. Note that the full dataframe is not retained in this mode, and the pandas reader is always used.
+    :type chunksize: number
+    :param dtype: an optional pandas-style dtype (or column-name-to-dtype dict) to apply while reading, e.g. ``{"state": "category"}`` to dictionary-encode a column during the parse itself; only applies to the pandas-based readers
+    :type dtype: str or dict
+    :param sample_rows: if set and the file has more rows than this, classify the columns using a random sample of this many rows, then re-scan only the columns that need exact statistics; columns the sample classifies as freetext are never fully scanned. Not used together with chunksize.
+    :type sample_rows: number
 
     :return: whether or not the loading was successful
     :rtype: bool
@@ -120,9 +187,15 @@ class SchemaGenerator:
     # the file that we're reading in.
     self.input_csv_file = input_csv_file
 
-    # Read the file into the local dataframe
+    # Read the file into the local dataframe (or, if we're streaming
+    # the file in chunks, get an iterator of chunk dataframes)
     try:
-      self.input_data_as_dataframe = self._load_csv(self.input_csv_file)
+      if chunksize:
+        input_data_as_chunks = self._load_csv(self.input_csv_file,
+            chunksize=chunksize, dtype=dtype)
+      else:
+        self.input_data_as_dataframe = self._load_csv(self.input_csv_file,
+            engine=engine, dtype=dtype)
     except: # Logging the full exception... pylint: disable=bare-except
       # Re-clear these variables to make sure nothing is in a half-loaded state
       self._clear_class_variables()
@@ -132,17 +205,43 @@ class SchemaGenerator:
 
     try:
       # Do the processing needed to generate the schema
-      (self.output_schema, self.output_datatypes) = \
-            self._build_schema(
-                self.input_data_as_dataframe,
-                include_text_columns=include_text_columns,
-                skip_columns=skip_columns,
-                max_values_for_categorical=max_values_for_categorical,
-                num_bins=num_bins,
-                include_na=include_na,
-                categorical_columns=categorical_columns,
-                geographical_columns=geographical_columns
-            )
+      if chunksize:
+        (self.output_schema, self.output_datatypes) = \
+              self._build_schema_streaming(
+                  input_data_as_chunks,
+                  include_text_columns=include_text_columns,
+                  skip_columns=skip_columns,
+                  max_values_for_categorical=max_values_for_categorical,
+                  num_bins=num_bins,
+                  include_na=include_na,
+                  categorical_columns=categorical_columns,
+                  geographical_columns=geographical_columns
+              )
+      elif sample_rows and len(self.input_data_as_dataframe) > sample_rows:
+        (self.output_schema, self.output_datatypes) = \
+              self._build_schema_sampled(
+                  self.input_data_as_dataframe,
+                  sample_rows,
+                  include_text_columns=include_text_columns,
+                  skip_columns=skip_columns,
+                  max_values_for_categorical=max_values_for_categorical,
+                  num_bins=num_bins,
+                  include_na=include_na,
+                  categorical_columns=categorical_columns,
+                  geographical_columns=geographical_columns
+              )
+      else:
+        (self.output_schema, self.output_datatypes) = \
+              self._build_schema(
+                  self.input_data_as_dataframe,
+                  include_text_columns=include_text_columns,
+                  skip_columns=skip_columns,
+                  max_values_for_categorical=max_values_for_categorical,
+                  num_bins=num_bins,
+                  include_na=include_na,
+                  categorical_columns=categorical_columns,
+                  geographical_columns=geographical_columns
+              )
     except: # Logging the full exception... pylint: disable=bare-except
       # Re-clear these variables to make sure nothing is in a half-loaded state
       self._clear_class_variables()
@@ -248,6 +347,22 @@ class SchemaGenerator:
     # pylint: enable=line-too-long
     return self.output_datatypes
 
+  def get_parsed_date_columns(self):
+    # Allow long lines in docs, because params. pylint: disable=line-too-long
+    """Returns the parsed datetime values for the columns that the most
+    recent parse detected as dates, as a dict of column name to a pandas
+    Series of datetimes (with NA values removed). Detecting a date column
+    requires parsing its values anyway, so this lets consumers that need
+    the actual datetimes reuse that work instead of running
+    ``pandas.to_datetime`` over the same column a second time. Returns an
+    empty dict if no file has been parsed, or if no columns were dates.
+
+    :return: a dict mapping column names to their parsed datetime values
+    :rtype: dict
+    """
+    # pylint: enable=line-too-long
+    return self._parsed_dates
+
   def output_parameters_json(self, output_directory = "."):
     # Allow long lines in docs, because URLs. pylint: disable=line-too-long
     """This method outputs the ``parameters.json`` file into
@@ -270,9 +385,7 @@ class SchemaGenerator:
     self.log.info("Writing output parameters file %s...", output_file)
 
     try:
-      with open(output_file, "w", encoding="utf-8") as write_file:
-        json.dump(self.output_schema, write_file, indent=2)
-        write_file.write("\n") # Include a newline at the end because POSIX.
+      self._dump_json(self.output_schema, output_file)
     except FileNotFoundError:
       self.log.error("Can't write to '%s'. Does the parent directory exist?",
                 output_file)
@@ -307,9 +420,7 @@ class SchemaGenerator:
     self.log.info("Writing output column datatypes file %s...", output_file)
 
     try:
-      with open(output_file, "w", encoding="utf-8") as write_file:
-        json.dump(self.output_datatypes, write_file, indent=2)
-        write_file.write("\n") # Include a newline at the end because POSIX.
+      self._dump_json(self.output_datatypes, output_file)
     except FileNotFoundError:
       self.log.error("Can't write to '%s'. Does the parent directory exist?",
                 output_file)
@@ -323,6 +434,63 @@ class SchemaGenerator:
     return output_file
 
   # PRIVATE METHODS BELOW HERE
+  def _dump_json(self, json_object, output_file):
+    # Allow long lines in docs, because params. pylint: disable=line-too-long
+    """This method serializes a dict to a JSON file, using orjson
+    if it's available (it's several times faster than the stdlib json
+    module, which matters for schemae with large categorical value lists)
+    and the stdlib json module otherwise. Both paths produce the same
+    2-space-indented output, with a trailing newline because POSIX.
+
+    :param json_object: the dict to serialize
+    :type json_object: dict
+    :param output_file: the path of the file to write (will raise exceptions if it encounters them)
+    :type output_file: str
+    """
+    # pylint: enable=line-too-long
+
+    # Normalize NaN to None before serializing. orjson writes NaN as
+    # "null" while the stdlib json module writes the literal "NaN"
+    # (which isn't valid JSON), so without this step the output would
+    # depend on which packages are installed
+    json_object = self._replace_nan_with_none(json_object)
+
+    # Serialize to one bytes object up front and write it in a single
+    # call; dumping straight into a text-mode file pays the TextIOWrapper
+    # encoding cost and makes many small writes
+    if orjson is not None:
+      # OPT_SERIALIZE_NUMPY lets any numpy arrays/scalars that end up in
+      # the schema be written directly, without boxing each element into
+      # a Python object first
+      data = orjson.dumps(json_object,
+          option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+      data = json.dumps(json_object, indent=2).encode("utf-8")
+
+    with open(output_file, "wb") as write_file:
+      write_file.write(data)
+      write_file.write(b"\n") # Include a newline at the end because POSIX.
+
+  def _replace_nan_with_none(self, json_object):
+    """This method walks a schema dict and replaces any NaN values
+    with None, so they serialize as JSON ``null`` regardless of which
+    serializer _dump_json ends up using. (NaN gets into the schema when
+    a numeric categorical column is built with ``include_na``.)
+
+    :param json_object: the dict (or nested list/value) to normalize
+    :type json_object: dict
+    :return: the normalized object
+    """
+    if isinstance(json_object, dict):
+      return {key: self._replace_nan_with_none(value)
+          for (key, value) in json_object.items()}
+    if isinstance(json_object, list):
+      return [self._replace_nan_with_none(value) for value in json_object]
+    # np.float64 is a subclass of float, so this catches both
+    if isinstance(json_object, float) and math.isnan(json_object):
+      return None
+    return json_object
+
   def _clear_class_variables(self):
     """This method just clears out the class
     variables, and resets the SchemaGenerator to
@@ -332,16 +500,43 @@ class SchemaGenerator:
     self.output_datatypes = None
     self.input_data_as_dataframe = None
     self.input_csv_file = None
+    # Parsed datetime values for the columns that were detected as
+    # dates, keyed by column name; kept so callers don't have to pay
+    # for a second pd.to_datetime over the same column
+    self._parsed_dates = {}
 
-  def _load_csv(self, input_csv_file):
+  def _load_csv(self, input_csv_file, engine = DEFAULT_CSV_ENGINE,
+            chunksize = None, dtype = None):
     # Allow long lines in docs, because params. pylint: disable=line-too-long
     """
     Loads in the CSV file as a pandas DataFrame.
 
+    When the "polars" engine is requested, this will use the multi-threaded
+    ``polars.read_csv`` parser and convert the result to pandas; when the
+    "pyarrow" engine is requested, this will have pandas hand the parse to
+    the multi-threaded Arrow C++ CSV reader. Both can be several times
+    faster than ``pandas.read_csv`` on large files. If the requested
+    engine's package is not installed, this falls back to plain pandas
+    (with a warning) so that callers don't need to care what's available.
+
+    When a chunksize is given, this returns a pandas chunk iterator instead
+    of a fully materialized dataframe, so that callers can process the file
+    one chunk at a time without ever holding all of it in memory. The
+    default pandas reader is always used in that case.
+
+    The most recently parsed file is cached (keyed by path, mtime, and
+    size), so calling this again for an unchanged file skips the parse.
+
     :param input_csv_file: the CSV file that should be examined to determine the schema
     :type input_csv_file: str
-
-    :return: The input CSV file as a dataframe (will raise exceptions if it encounters them)
+    :param engine: which engine to use to read the CSV file ("pandas", "polars", or "pyarrow")
+    :type engine: str
+    :param chunksize: if set, return an iterator of dataframes of this many rows each instead of a single dataframe
+    :type chunksize: number
+    :param dtype: an optional pandas-style dtype (or column-name-to-dtype dict) to apply while reading; only applies to the pandas-based readers, so the polars engine is skipped when this is set
+    :type dtype: str or dict
+
+    :return: The input CSV file as a dataframe, or an iterator of dataframes if chunksize is set (will raise exceptions if it encounters them)
     :rtype: pandas.DataFrame
     """
     # pylint: enable=line-too-long
@@ -351,38 +546,113 @@ class SchemaGenerator:
     # Set a default return value
     input_data_as_dataframe = None
 
-    # Read in the input file with pandas. If this fails,
-    # throw an error and get out.
+    # See if we already parsed this exact file (same path, same mtime,
+    # same size); if so, hand back the cached dataframe instead of paying
+    # for the parse again. Chunked reads are single-use iterators, so
+    # they're never cached.
+    cache_key = None
+    if not chunksize:
+      try:
+        # The engine is part of the key: the polars/pyarrow readers
+        # don't guarantee the same dtypes as pandas' default reader, so
+        # a frame parsed by one engine must not satisfy a request for
+        # another
+        cache_key = (input_csv_file, os.path.getmtime(input_csv_file),
+            os.path.getsize(input_csv_file), str(dtype), engine)
+      except OSError:
+        # Can't stat the file; let the reader below raise its usual,
+        # nicely logged error
+        cache_key = None
+      if cache_key is not None and cache_key in _CSV_CACHE:
+        self.log.info("Reusing previously parsed CSV file.")
+        # Hand back a shallow copy: the column buffers are shared (so
+        # nothing is re-read or re-parsed), but the caller gets its own
+        # frame and can't accidentally poison the cache for another
+        # SchemaGenerator by adding/dropping columns on the result
+        return _CSV_CACHE[cache_key].copy(deep=False)
+
+    # If the caller asked for the polars engine, try to use it; polars is
+    # an optional dependency, so fall back to pandas if it isn't available.
+    # Chunked reading and explicit dtypes always go through pandas.
+    if engine == "polars" and not chunksize and dtype is None:
+      try:
+        import polars as pl # Optional import... pylint: disable=import-outside-toplevel
+      except ImportError:
+        self.log.warning("The 'polars' engine was requested, but the \
+'polars' package is not installed. Falling back to 'pandas.read_csv()'.")
+      else:
+        try:
+          # rechunk=False skips a post-parse copy that we don't need, since
+          # we immediately hand the data over to pandas anyway.
+          input_data_as_dataframe = pl.read_csv(input_csv_file,
+              rechunk=False).to_pandas()
+        except Exception as err:
+          # An error was thrown that we weren't expecting; log and
+          # rethrow (but let KeyboardInterrupt and friends propagate)
+          self.log.error("\nUsing input file: '%s', \
+The system received an unexpected error when trying to \
+parse the input file using 'polars.read_csv()'.", input_csv_file)
+          raise err
+
+        self.log.info("Successfully read CSV file.")
+        if cache_key is not None:
+          # Keep just the most recent file; this is a "same file again"
+          # cache, not a general-purpose one. Hand the caller the same
+          # shallow copy a cache hit would get, so the first caller
+          # can't restructure the stored frame either
+          _CSV_CACHE.clear()
+          _CSV_CACHE[cache_key] = input_data_as_dataframe
+          input_data_as_dataframe = input_data_as_dataframe.copy(deep=False)
+        return input_data_as_dataframe
+
+    # The "pyarrow" engine hands the parse to the multi-threaded Arrow
+    # C++ CSV reader, which is considerably faster than pandas' default
+    # C engine on large files. pyarrow is an optional dependency, and its
+    # reader doesn't support chunked reads, so fall back to the default
+    # engine in either of those cases.
+    read_csv_kwargs = {}
+    if engine == "pyarrow" and not chunksize:
+      try:
+        import pyarrow # Optional import... pylint: disable=import-outside-toplevel,unused-import
+      except ImportError:
+        self.log.warning("The 'pyarrow' engine was requested, but the \
+'pyarrow' package is not installed. Falling back to the default \
+'pandas.read_csv()' engine.")
+      else:
+        read_csv_kwargs["engine"] = "pyarrow"
+
+    if dtype is not None:
+      read_csv_kwargs["dtype"] = dtype
+
+    # Read in the input file with pandas. If this fails, log a helpful
+    # message for the common errors (looked up in _LOAD_ERR_MSGS) and
+    # rethrow. Note this deliberately catches Exception, not
+    # BaseException: a KeyboardInterrupt during the parse should
+    # propagate, not get logged as a parse failure.
     try:
-      input_data_as_dataframe = pd.read_csv(input_csv_file)
-    except pd.errors.ParserError as err:
-      # This is likely to be a common error, so check for it explicitly
-      self.log.error("Using input file: '%s', \
-'pandas.read_csv()' was unable to parse the input file \
-as a CSV. Please confirm that it contains valid comma-separated \
-values.", input_csv_file)
-      raise err
-    except FileNotFoundError as err:
-      # This is likely to be a common error, so check for it explicitly
-      self.log.error("Using input file: '%s', \
-the file was not found. Please confirm the specified \
-path, or use a full path instead of a relative path.", input_csv_file)
-      raise err
-    except pd.errors.EmptyDataError as err:
-      # This is likely to be a common error, so check for it explicitly
-      self.log.error("\nUsing input file: '%s', \
-The file appears to be empty. Please confirm the path.",
-          input_csv_file)
-      raise err
-    except BaseException as err:
-      # An error was thrown that we weren't expecting; log and rethrow to caller
-      self.log.error("\nUsing input file: '%s', \
+      input_data_as_dataframe = pd.read_csv(input_csv_file,
+          chunksize=chunksize, **read_csv_kwargs)
+    except Exception as err:
+      message = next(
+          (msg for (err_type, msg) in _LOAD_ERR_MSGS.items()
+              if isinstance(err, err_type)),
+          "\nUsing input file: '%s', \
 The system received an unexpected error when trying to \
-parse the input file using 'pandas.read_csv()'.", input_csv_file)
+parse the input file using 'pandas.read_csv()'.")
+      self.log.error(message, input_csv_file)
       raise err
 
     self.log.info("Successfully read CSV file.")
 
+    if cache_key is not None:
+      # Keep just the most recent file; this is a "same file again"
+      # cache, not a general-purpose one. Hand the caller the same
+      # shallow copy a cache hit would get, so the first caller can't
+      # restructure the stored frame either
+      _CSV_CACHE.clear()
+      _CSV_CACHE[cache_key] = input_data_as_dataframe
+      input_data_as_dataframe = input_data_as_dataframe.copy(deep=False)
+
     return input_data_as_dataframe
 
 
@@ -451,50 +721,365 @@ parse the input file using 'pandas.read_csv()'.", input_csv_file)
     output_schema = { "schema": {} }
     output_datatypes = { "dtype": {} }
 
-    # loop over each column, and add the values and the datatype to the dict
-    for column in input_data_as_dataframe.columns:
+    # Figure out which columns we actually need to look at. Iterating
+    # df.items() pulls each column out in one pass, instead of a separate
+    # df[column] lookup per column later.
+    columns_to_infer = []
+    series_to_infer = []
+    for (column, series) in input_data_as_dataframe.items():
       if column.strip(" ") in skip_columns:
         self.log.info("Skipping column %s as requested", column)
         continue
+      columns_to_infer.append(column)
+      series_to_infer.append(series)
+
+    # Infer each column's schema. The columns are completely independent
+    # of each other, and the heavy lifting (unique/min/max/date parsing)
+    # happens in pandas/numpy C code that releases the GIL, so spread the
+    # columns across a thread pool; on wide dataframes this scales with
+    # the number of cores. executor.map returns results in submission
+    # order, so the output schema keeps the original column order.
+    def infer_column(column, series):
+      # Closes over the inference options so it can be mapped over the
+      # (column, series) pairs directly
+      return self._infer_column_schema(
+          column, series,
+          include_text_columns=include_text_columns,
+          max_values_for_categorical=max_values_for_categorical,
+          num_bins=num_bins,
+          include_na=include_na,
+          categorical_columns=categorical_columns,
+          geographical_columns=geographical_columns
+      )
+    if len(columns_to_infer) <= 1:
+      # Nothing to overlap; don't pay for spinning up a thread pool
+      column_schemae = list(map(infer_column,
+          columns_to_infer, series_to_infer))
+    else:
+      with concurrent.futures.ThreadPoolExecutor(
+          max_workers=os.cpu_count()) as executor:
+        column_schemae = list(executor.map(infer_column,
+            columns_to_infer, series_to_infer))
+
+    for (column, col_schema) in zip(columns_to_infer, column_schemae):
+      # A column that was dropped (e.g. freetext) has no schema
+      if col_schema is None:
+        continue
+      output_schema["schema"][column] = col_schema
+      # Also add this column and its datatype to the output_datatypes dict
+      output_datatypes["dtype"][column] = col_schema["dtype"]
 
-      # The actual values for the column
-      series = input_data_as_dataframe[column]
-      if not include_na:
+    self.log.info("Schema building successful.")
+    return (output_schema, output_datatypes)
+
+
+  def _infer_column_schema(self, column, series,
+            include_text_columns = DEFAULT_INCLUDE_TEXT,
+            max_values_for_categorical = DEFAULT_MAX_VALUES_FOR_CATEGORICAL,
+            num_bins = DEFAULT_NUM_BINS,
+            include_na = DEFAULT_INCLUDE_NA,
+            categorical_columns = None,
+            geographical_columns = None):
+    # Allow long lines in docs, because params. pylint: disable=line-too-long
+    """This method infers the schema for a single column. It holds the
+    per-column business logic that ``_build_schema`` applies to every
+    column in the dataframe, and can safely be called for several columns
+    concurrently.
+
+    :param column: the name of the column being examined
+    :type column: str
+    :param series: the values of the column being examined
+    :type series: pandas.Series
+    :param include_text_columns: whether or not to include columns that have a kind of "text" (non-categorical string fields)
+    :type include_text_columns: bool
+    :param max_values_for_categorical: columns with fewer than this many values will be considered categorical
+    :type max_values_for_categorical: number
+    :param num_bins: informational value to include in the output schema to indicate how many 'bins' should be used for numeric values
+    :type num_bins: number
+    :param include_na: whether or not to include ``NaN`` as a value for categorical fields
+    :type include_na: bool
+    :param categorical_columns: a list of names of columns to always treat as categorical, regardless of number of values
+    :type categorical_columns: list
+    :param geographical_columns: a list of names of columns to always treat as geographical (and therefore categorical)
+    :type geographical_columns: list
+
+    :return: a dict representing the schema for this column, or None if the column should be left out of the schema
+    :rtype: dict
+    """
+    # pylint: enable=line-too-long
+
+    if not categorical_columns:
+      categorical_columns = []
+    if not geographical_columns:
+      geographical_columns = []
+
+    if not include_na:
+      # This runs once per column, which adds up on very wide dataframes,
+      # so skip the logging machinery entirely when INFO is disabled
+      if self.log.isEnabledFor(logging.INFO):
         self.log.info("Removing NA values from column %s", column)
-        series.dropna(inplace=True)
+      # Don't use inplace=True here: the series is a view of the caller's
+      # dataframe, and dropping rows in place can mutate (or warn about
+      # mutating) the dataframe that was passed in
+      series = series.dropna()
+
+    # Local variable to store the schema for this particular column
+    col_schema = {}
+
+    # Unique values for this column. Columns that were explicitly
+    # requested as categorical need their full value set; for everything
+    # else we only need the uniques if there are few enough of them for
+    # the column to be categorical, so use the bounded probe, which
+    # stops hashing values as soon as that's no longer possible.
+    # Columns pandas already stores as `category` dtype keep their
+    # distinct values in the dtype itself, so no hashing is needed at all.
+    min_max = None
+    if isinstance(series.dtype, pd.CategoricalDtype):
+      values = np.asarray(series.unique())
+      if len(values) > max_values_for_categorical and \
+          column.strip(" ") not in categorical_columns and \
+          column.strip(" ") not in geographical_columns:
+        values = None
+    elif column.strip(" ") in categorical_columns or \
+        column.strip(" ") in geographical_columns:
+      values = pd.unique(series)
+    else:
+      (values, min_max) = self._bounded_unique(series,
+          max_values_for_categorical, track_min_max=True)
+
+    # Hand the unique values (if we have them) and any min/max computed
+    # along the way to _get_series_dtype, so it doesn't re-scan the column
+    (datatype, min_value, max_value) = self._get_series_dtype(series,
+        unique_values=values, min_max=min_max, column=column)
+    col_schema["dtype"] = datatype
+
+    # Now, decide if this should be treated as a categorical value or
+    # something else: if the bounded probe gave up (too many unique
+    # values) and the column wasn't explicitly requested as categorical,
+    # it isn't one.
+    if values is not None:
+
+      # Treat as a categorical value and output a list of unique values
+      if column in geographical_columns:
+        col_schema["kind"] = "geographical"
+      else:
+        col_schema["kind"] = "categorical"
+
+      # If we're including NA, it's frequently not going to be sortable,
+      # so don't even try
+      if not include_na:
+        values = self._sort_values(values)
+      col_schema["values"] = values.tolist()
+      col_schema["codes"] = list(range(1, len(values)+1))
+
+    else:
+      # Not categorical data
+      if col_schema["dtype"] == "str":
+        if not include_text_columns:
+          self.log.warning("Skipping '%s' because it is freetext. If you \
+need this column, consider using the '-m' option to increase the size of \
+categorical variables, or include text columns using the '-t' option.", column)
+          return None
+
+        self.log.warning("\nNot using values for column '%s' \
+because it is non-numeric and there are more than %s \
+unique values for it. This column will be labeled as a \
+'text' kind of string, and values will not be included.",
+            str(column), str(max_values_for_categorical))
+        col_schema["kind"] = "text"
+      elif col_schema["dtype"] == "date":
+        col_schema["kind"] = "date"
+        col_schema["min"] = min_value
+        col_schema["max"] = max_value
+      else:
+        # Treat it as a numeric value.
+        col_schema["kind"] = "numeric"
+        col_schema["min"] = min_value
+        col_schema["max"] = max_value
+        if num_bins > 0:
+          col_schema["bins"] = num_bins
+
+    return col_schema
 
-      # Local variable to store the schema for this particular column
+
+  def _build_schema_streaming(self, input_data_as_chunks,
+            include_text_columns = DEFAULT_INCLUDE_TEXT, skip_columns = None,
+            max_values_for_categorical = DEFAULT_MAX_VALUES_FOR_CATEGORICAL,
+            num_bins = DEFAULT_NUM_BINS,
+            include_na = DEFAULT_INCLUDE_NA,
+            categorical_columns = None,
+            geographical_columns = None):
+    # Allow long lines in docs, because params. pylint: disable=line-too-long
+    """This method builds the same schema object as ``_build_schema``, but
+    from an iterator of dataframe chunks instead of a single dataframe, so
+    that only one chunk of the input file is ever in memory at a time.
+
+    Each chunk is consumed exactly once; per-column accumulators track the
+    unique values (until there are too many of them for the column to still
+    be categorical, at which point the set is discarded) and running min/max
+    values. After the last chunk, the datatype for each column is determined
+    from its accumulated unique values (or, for high-cardinality columns,
+    from its min/max and a small retained sample), which keeps the memory
+    used independent of the number of rows in the input file.
+
+    Note that for high-cardinality date columns, the min/max is determined
+    from the string ordering of the values; this is correct for dates in
+    ISO format (e.g. "2021-02-25"), but may not be for other date formats.
+
+    :param input_data_as_chunks: an iterator of pandas DataFrames (e.g. from ``pandas.read_csv`` with a chunksize), each of which will be examined to determine the schema
+    :type input_data_as_chunks: iterator
+    :param include_text_columns: whether or not to include columns that have a kind of "text" (non-categorical string fields)
+    :type include_text_columns: bool
+    :param skip_columns: a list of names of columns to skip completely
+    :type skip_columns: list
+    :param max_values_for_categorical: columns with fewer than this many values will be considered categorical
+    :type max_values_for_categorical: number
+    :param num_bins: informational value to include in the output schema to indicate how many 'bins' should be used for numeric values
+    :type num_bins: number
+    :param include_na: whether or not to include ``NaN`` as a value for categorical fields
+    :type include_na: bool
+    :param categorical_columns: a list of names of columns to always treat as categorical, regardless of number of values
+    :type categorical_columns: list
+    :param geographical_columns: a list of names of columns to always treat as geographical (and therefore categorical)
+    :type geographical_columns: list
+
+    :return: tuple of dicts representing the full schema and the column datatypes, respectively
+    :rtype: tuple
+    """
+    # pylint: enable=line-too-long
+
+    if include_na:
+      self.log.info("Building schema from chunks...")
+    else:
+      self.log.info("Building schema from chunks without using NAs...")
+
+    if not categorical_columns:
+      categorical_columns = []
+    if not geographical_columns:
+      geographical_columns = []
+    if not skip_columns:
+      skip_columns = []
+
+    # How many values to retain per column for datatype sniffing of
+    # high-cardinality columns (where we don't keep the unique values)
+    sample_size = max_values_for_categorical
+
+    # Per-column accumulators, keyed by column name (in file order)
+    col_states = {}
+
+    # Consume each chunk exactly once, folding it into the accumulators
+    for chunk in input_data_as_chunks:
+      for column in chunk.columns:
+        if column.strip(" ") in skip_columns:
+          continue
+
+        series = chunk[column]
+
+        state = col_states.setdefault(column, {
+            "values": set(), "overflowed": False,
+            "min": None, "max": None,
+            "has_na": False, "sample": None
+        })
+
+        # Track whether the column has any NAs, then work without them
+        # (NaN != NaN, so a set would otherwise accumulate one NaN per chunk)
+        state["has_na"] = state["has_na"] or bool(series.isna().any())
+        series = series.dropna().infer_objects()
+
+        if state["sample"] is None:
+          state["sample"] = series.head(sample_size)
+
+        # A column stays a categorical candidate until its unique count
+        # exceeds the cap; after that, stop hashing its values entirely.
+        # Columns that were explicitly requested as categorical always
+        # need their full value set, so they never overflow.
+        if not state["overflowed"]:
+          state["values"].update(pd.unique(series).tolist())
+          if len(state["values"]) > max_values_for_categorical and \
+              column.strip(" ") not in categorical_columns and \
+              column.strip(" ") not in geographical_columns:
+            state["overflowed"] = True
+            state["values"] = set() # Release the memory; we won't need them
+
+        # Fold in the running min/max. For string columns this is the
+        # lexicographic min/max, which is what we want for ISO dates.
+        try:
+          chunk_min = series.min()
+          chunk_max = series.max()
+        except: # Unorderable (e.g. mixed-type) values... pylint: disable=bare-except
+          continue
+        if len(series) > 0:
+          if state["min"] is None or chunk_min < state["min"]:
+            state["min"] = chunk_min
+          if state["max"] is None or chunk_max > state["max"]:
+            state["max"] = chunk_max
+
+    # Start the return value off with an empty schema structure
+    output_schema = { "schema": {} }
+    output_datatypes = { "dtype": {} }
+
+    # Now emit the schema for each column from its accumulators
+    for column, state in col_states.items():
       col_schema = {}
 
-      # Unique values for this column
-      values = pd.unique(series)
+      if not state["overflowed"]:
+        # We kept the full set of unique values, so the datatype and
+        # min/max can be determined from them directly (the min/max of the
+        # unique values is the min/max of the column).
+        if include_na:
+          # _infer_column_schema leaves categorical values unsorted when
+          # NAs are included (NaN makes them unsortable), so match it
+          values = pd.Series(list(state["values"]))
+        else:
+          try:
+            values = pd.Series(sorted(state["values"]))
+          except: # Logging the full exception... pylint: disable=bare-except
+            self.log.exception("Encountered an error when trying to sort \
+the values. Will include them without sorting.")
+            values = pd.Series(list(state["values"]))
+        if state["has_na"] and values.dtype.kind in "iu":
+          # A full read parses a numeric column with NAs as float64 (NaN
+          # forces the upcast), so report float here too; the accumulated
+          # values only look integral because each chunk was deduped
+          # after dropna(). Without this the dtype would depend on where
+          # the chunk boundaries happened to fall.
+          values = values.astype("float64")
+        (datatype, min_value, max_value) = self._get_series_dtype(values)
+      else:
+        # High-cardinality column: determine the datatype from the retained
+        # sample, and use the running min/max for the range.
+        (datatype, min_value, max_value) = \
+            self._get_series_dtype(state["sample"])
+        if datatype == "date":
+          # The accumulated min/max are strings; present them the same
+          # way as the non-streaming path (rounded to the nearest day)
+          min_value = str(pd.to_datetime(state["min"]).floor("D"))
+          max_value = str(pd.to_datetime(state["max"]).ceil("D"))
+        elif datatype != "str":
+          # Numeric: re-derive the datatype from the overall min/max, since
+          # the sample alone might suggest too narrow an integer type
+          min_max_series = pd.Series([state["min"], state["max"]])
+          if state["has_na"] and min_max_series.dtype.kind in "iu":
+            # Same float upcast as the categorical branch: a full read
+            # of a column with NAs would have been float64
+            min_max_series = min_max_series.astype("float64")
+          (datatype, min_value, max_value) = self._get_series_dtype(
+              min_max_series)
 
-      (datatype, min_value, max_value) = self._get_series_dtype(series)
       col_schema["dtype"] = datatype
 
-      # Now, decide if this should be treated as a categorical value or
-      # something else, by checking to see how many unique values
-      # there are.
-      if column.strip(" ") in categorical_columns or \
-          column.strip(" ") in geographical_columns or \
-          len(values) <= max_values_for_categorical:
-
+      if not state["overflowed"]:
         # Treat as a categorical value and output a list of unique values
-        if column in geographical_columns:
+        if column.strip(" ") in geographical_columns:
           col_schema["kind"] = "geographical"
         else:
           col_schema["kind"] = "categorical"
 
-        # If we're including NA, it's frequently not going to be sortable,
-        # so don't even try
-        if not include_na:
-          try:
-            values.sort()
-          except: # Logging the full exception... pylint: disable=bare-except
-            self.log.exception("Encountered an error when trying to sort the \
-values. Will include them without sorting.")
-        col_schema["values"] = values.tolist()
-        col_schema["codes"] = list(range(1, len(values)+1))
+        values_list = values.tolist()
+        if include_na and state["has_na"]:
+          values_list.append(np.nan)
+        col_schema["values"] = values_list
+        col_schema["codes"] = list(range(1, len(values_list)+1))
 
       else:
         # Not categorical data
@@ -503,7 +1088,6 @@ values. Will include them without sorting.")
             self.log.warning("Skipping '%s' because it is freetext. If you \
 need this column, consider using the '-m' option to increase the size of \
 categorical variables, or include text columns using the '-t' option.", column)
-            col_schema = None
             continue
 
           self.log.warning("\nNot using values for column '%s' \
@@ -532,7 +1116,254 @@ unique values for it. This column will be labeled as a \
     return (output_schema, output_datatypes)
 
 
-  def _get_series_dtype(self, series, fuzz_min_max=False):
+  def _build_schema_sampled(self, input_data_as_dataframe, sample_rows,
+            include_text_columns = DEFAULT_INCLUDE_TEXT, skip_columns = None,
+            max_values_for_categorical = DEFAULT_MAX_VALUES_FOR_CATEGORICAL,
+            num_bins = DEFAULT_NUM_BINS,
+            include_na = DEFAULT_INCLUDE_NA,
+            categorical_columns = None,
+            geographical_columns = None):
+    # Allow long lines in docs, because params. pylint: disable=line-too-long
+    """This method builds the same schema object as ``_build_schema``, but
+    classifies the columns using only a random row sample, and then
+    re-scans the full data only for the columns whose schema needs exact
+    statistics (categorical values and numeric/date ranges). Columns the
+    sample classifies as freetext are never scanned in full, which is
+    where most of the time goes on large files: those columns would
+    otherwise pay for per-value string hashing and date probing just to
+    be dropped (or emitted without values).
+
+    :param input_data_as_dataframe: a pandas DataFrame that should be examined to determine the schema
+    :type input_data_as_dataframe: pandas.DataFrame
+    :param sample_rows: how many rows to sample for the classification pass
+    :type sample_rows: number
+    :param include_text_columns: whether or not to include columns that have a kind of "text" (non-categorical string fields)
+    :type include_text_columns: bool
+    :param skip_columns: a list of names of columns to skip completely
+    :type skip_columns: list
+    :param max_values_for_categorical: columns with fewer than this many values will be considered categorical
+    :type max_values_for_categorical: number
+    :param num_bins: informational value to include in the output schema to indicate how many 'bins' should be used for numeric values
+    :type num_bins: number
+    :param include_na: whether or not to include ``NaN`` as a value for categorical fields
+    :type include_na: bool
+    :param categorical_columns: a list of names of columns to always treat as categorical, regardless of number of values
+    :type categorical_columns: list
+    :param geographical_columns: a list of names of columns to always treat as geographical (and therefore categorical)
+    :type geographical_columns: list
+
+    :return: tuple of dicts representing the full schema and the column datatypes, respectively
+    :rtype: tuple
+    """
+    # pylint: enable=line-too-long
+
+    self.log.info("Building schema from a %s-row sample...", sample_rows)
+
+    # Classify the columns on the sample. random_state is fixed so that
+    # repeated runs over the same file produce the same schema.
+    (output_schema, output_datatypes) = self._build_schema(
+        input_data_as_dataframe.sample(n=sample_rows, random_state=0),
+        include_text_columns=include_text_columns,
+        skip_columns=skip_columns,
+        max_values_for_categorical=max_values_for_categorical,
+        num_bins=num_bins,
+        include_na=include_na,
+        categorical_columns=categorical_columns,
+        geographical_columns=geographical_columns
+    )
+
+    # Now confirm the classification and compute exact statistics against
+    # the full data, for every column except the freetext ones (a column
+    # whose sample already has too many unique string values will only
+    # have more of them in the full data)
+    for column in list(output_schema["schema"]):
+      if output_schema["schema"][column]["kind"] == "text":
+        continue
+
+      col_schema = self._infer_column_schema(
+          column, input_data_as_dataframe[column],
+          include_text_columns=include_text_columns,
+          max_values_for_categorical=max_values_for_categorical,
+          num_bins=num_bins,
+          include_na=include_na,
+          categorical_columns=categorical_columns,
+          geographical_columns=geographical_columns
+      )
+
+      if col_schema is None:
+        # The full data overruled the sample (e.g. a column that looked
+        # categorical turned out to be freetext that we're not including)
+        del output_schema["schema"][column]
+        del output_datatypes["dtype"][column]
+      else:
+        output_schema["schema"][column] = col_schema
+        output_datatypes["dtype"][column] = col_schema["dtype"]
+
+    self.log.info("Schema building successful.")
+    return (output_schema, output_datatypes)
+
+
+  def _sort_values(self, values):
+    # Allow long lines in docs, because params. pylint: disable=line-too-long
+    """
+    Sort an array of (unique) categorical values, using a typed C-level
+    sort where possible. Numeric and datetime arrays sort directly; object
+    arrays that really hold strings are coerced to numpy's fixed-width
+    string type first, since sorting an object array falls back to
+    per-element Python comparisons. Genuinely mixed-type arrays (which
+    aren't orderable at all in Python 3) are returned unsorted.
+
+    :param: values a numpy array of values to sort
+    :type: numpy.ndarray
+
+    :return: a sorted copy of the values (or the original values, unsorted, if they can't be sorted)
+    :rtype: numpy.ndarray
+    """
+    # pylint: enable=line-too-long
+
+    # Typed arrays always sort cleanly, so no exception handling is
+    # needed on this (hot) path
+    if values.dtype.kind in "iufMm":
+      return np.sort(values)
+    if pd.api.types.infer_dtype(values) == "string":
+      return np.sort(values.astype(str))
+
+    # Some other object array; try the plain sort and hope the values
+    # are comparable (mixed types raise TypeError in Python 3)
+    try:
+      values = values.copy()
+      values.sort()
+    except TypeError:
+      self.log.exception("Encountered an error when trying to sort the \
+values. Will include them without sorting.")
+    return values
+
+  def _bounded_unique(self, series, cap, block_size=65536,
+            track_min_max=False):
+    # Allow long lines in docs, because params. pylint: disable=line-too-long
+    """
+    Compute the unique values of a series, giving up early if there are
+    more than ``cap`` of them. For high-cardinality columns (IDs, free
+    text) this avoids hashing every value in the column just to learn
+    that the column isn't categorical: the series is deduplicated one
+    block at a time, and as soon as the running unique count exceeds the
+    cap, we stop and return ``None``.
+
+    With ``track_min_max``, the min/max of numeric columns comes along
+    for free: while the unique set stays under the cap, it's a superset
+    of {min, max}, so the reductions run over just the (small) unique
+    array at the end. Only once the set overflows the cap do the
+    remaining blocks get scanned for min/max (no more hashing), so a
+    high-cardinality numeric column still gets its exact range without
+    the caller making a second pass over it.
+
+    :param: series a pandas series to deduplicate
+    :type: pandas.series
+    :param: cap the maximum number of unique values worth collecting
+    :type: number
+    :param: block_size how many rows to deduplicate per block; defaults to 65536
+    :type: number
+    :param: track_min_max whether to also compute the numeric min/max in the same pass and return a (values, min_max) tuple; defaults to False
+    :type: boolean
+
+    :return: an array of the unique values (in order of first occurrence), or None if there are more than ``cap`` of them; if ``track_min_max`` is set, a tuple of that and either a (min, max) tuple or None (for non-numeric columns)
+    :rtype: numpy.ndarray
+    """
+    # pylint: enable=line-too-long
+
+    # If the column is Arrow-backed (e.g. the dataframe was built with
+    # dtype_backend="pyarrow"), deduplicate with Arrow's vectorized hash
+    # kernel instead of round-tripping the data through numpy, which for
+    # string columns would mean building an object array first.
+    # (pd.ArrowDtype only exists in pandas >= 1.5, so look it up with
+    # getattr; on older pandas nothing is Arrow-backed anyway.)
+    if isinstance(series.dtype, getattr(pd, "ArrowDtype", ())):
+      import pyarrow.compute as pc # Optional import... pylint: disable=import-outside-toplevel
+      uniques = pc.unique(series.array._pa_array) # No public accessor for the underlying array... pylint: disable=protected-access
+      if len(uniques) > cap:
+        uniques = None
+      else:
+        uniques = uniques.to_numpy(zero_copy_only=False)
+      if track_min_max:
+        return (uniques, None)
+      return uniques
+
+    arr = series.to_numpy()
+
+    # Only numeric columns get min/max folded in. The caller only
+    # removes NAs when include_na is off, so float columns can still
+    # contain NaN here; a plain reduction would propagate it into the
+    # schema's min/max, so float arrays get masked down to their
+    # non-NaN values before every reduction.
+    fold_min_max = track_min_max and arr.dtype.kind in "iuf"
+    strip_nan = arr.dtype.kind == "f"
+    col_min = None
+    col_max = None
+
+    values = None
+    overflowed = False
+    for start in range(0, len(arr), block_size):
+      block = arr[start:start + block_size]
+
+      if overflowed:
+        # Too many unique values already; we're only here for min/max
+        if strip_nan:
+          block = block[~np.isnan(block)]
+        if len(block) > 0:
+          block_min = block.min()
+          block_max = block.max()
+          if col_min is None:
+            col_min = block_min
+            col_max = block_max
+          else:
+            col_min = min(col_min, block_min)
+            col_max = max(col_max, block_max)
+        continue
+
+      block_uniques = pd.unique(block)
+      if values is None:
+        values = block_uniques
+      else:
+        # pd.unique preserves order of first occurrence, so earlier
+        # blocks' values stay ahead of later blocks' new values
+        values = pd.unique(np.concatenate([values, block_uniques]))
+      if len(values) > cap:
+        if not fold_min_max:
+          # Nothing left to compute; stop scanning entirely
+          if track_min_max:
+            return (None, None)
+          return None
+        # Seed the running min/max from the uniques collected so far
+        # (they're a superset of the min/max of the blocks seen so far),
+        # then keep scanning the remaining blocks for min/max only
+        seed = values[~np.isnan(values)] if strip_nan else values
+        if len(seed) > 0:
+          col_min = seed.min()
+          col_max = seed.max()
+        values = None
+        overflowed = True
+
+    if values is None and not overflowed:
+      # Empty series; mirror what pd.unique would return
+      values = pd.unique(arr)
+
+    if fold_min_max and not overflowed:
+      # The unique set never overflowed, so it's a superset of
+      # {min, max}; reducing over it instead of the full column saves
+      # two full-length scans on every categorical numeric column
+      candidates = values[~np.isnan(values)] if strip_nan else values
+      if len(candidates) > 0:
+        col_min = candidates.min()
+        col_max = candidates.max()
+
+    if track_min_max:
+      if col_min is None:
+        return (values, None)
+      return (values, (col_min, col_max))
+    return values
+
+  def _get_series_dtype(self, series, fuzz_min_max=False,
+            unique_values=None, min_max=None, column=None):
     # Allow long lines in docs, because params. pylint: disable=line-too-long
     """
     Determine the datatype that we want to put into our schema files. This isn't
@@ -540,10 +1371,22 @@ unique values for it. This column will be labeled as a \
     Additionally, for numeric or datetime columns, determine the min/max values
     for the column (since we're examining the column anyway).
 
+    If the caller has already computed the unique values for the series
+    (as ``_build_schema`` has), they can be passed in; the min/max of the
+    unique values is the same as the min/max of the full series, and there
+    are usually far fewer of them to scan, so this avoids re-reading the
+    whole column.
+
     :param: series a pandas series to examine
     :type: pandas.series
     :param: fuzz_min_max whether or not to adjust the min/max values for numeric by a percentage; defaults to False
     :type: boolean
+    :param: unique_values an optional precomputed array of the unique values in the series, to compute statistics from instead of the full series
+    :type: numpy.ndarray
+    :param: min_max an optional precomputed (min, max) tuple for numeric series (e.g. from ``_bounded_unique`` with ``track_min_max``), used instead of re-reducing
+    :type: tuple
+    :param: column an optional column name; when given and the full series turns out to be dates, the parsed datetimes are retained in ``self._parsed_dates`` for reuse
+    :type: str
 
     :return: a tuple containing the string version of the datatype to use and, if relevant, min and max values
     :rtype: str
@@ -556,16 +1399,31 @@ unique values for it. This column will be labeled as a \
     min_value = None
     max_value = None
 
-    # Ask pandas to figure out the best possible datatype based on the data
-    series = series.infer_objects()
+    # If we were given the unique values, examine those instead of the
+    # full series; they produce the same datatype and min/max
+    if unique_values is not None:
+      series = pd.Series(unique_values)
 
-    if series.dtype.kind in ['i', 'u']: # pylint: disable=inconsistent-quotes
+    # Ask pandas to figure out the best possible datatype based on the
+    # data -- but only for object columns; a column that already has a
+    # typed dtype (the common case when the CSV reader did its job) can
+    # go straight to the branch for its kind without the inference pass
+    if series.dtype.kind == "O":
+      series = series.infer_objects()
+
+    if series.dtype.kind in _INT_KINDS:
       # If we believe the datatype is an int, we want to
       # calculate min and max values and then figure out the
       # smallest numpy int datatype that can store it, given the
-      # min and max values
-      min_value = series.min().item()
-      max_value = series.max().item()
+      # min and max values. Integer arrays can't hold NaN, so reduce
+      # on the raw numpy buffer and skip pandas' nan-handling dispatch.
+      if min_max is not None:
+        min_value = int(min_max[0])
+        max_value = int(min_max[1])
+      else:
+        arr = series.to_numpy()
+        min_value = arr.min().item()
+        max_value = arr.max().item()
 
       if fuzz_min_max:
         # Given these min and max values, "fuzz" them a little bit
@@ -580,17 +1438,17 @@ unique values for it. This column will be labeled as a \
         max_value = max_value + padding_margin
 
       # Now determine the smallest type that will work for both the min
-      # and the max value.
-      # NOTE (mch): I wasn't able to find a clever way to do this, so since
-      # we know it's an int, let's just try them all. (a trick like
+      # and the max value, by checking them against the static range
+      # table (plain int comparisons; no numpy dtype-promotion calls).
+      # NOTE (mch): a trick like
       # np.promote_types(np.min_scalar_type(min), np.min_scalar_type(max))
       # won't work because if the min/max are something like -4/4,
       # promote_types will give you an int16 instead of an int8, because
       # you end up with promote_types(int8, uint8) which gives you an int16
-      for dtype in [np.uint8, np.int8, np.uint16, np.int16,
-              np.uint32, np.int32, np.uint64, np.int64]:
-        if np.can_cast(min_value, dtype) and np.can_cast(max_value, dtype):
-          smallest_type = dtype(0).dtype.name
+      smallest_type = None
+      for (dtype_name, dtype_min, dtype_max) in INT_DTYPE_RANGES:
+        if dtype_min <= min_value and max_value <= dtype_max:
+          smallest_type = dtype_name
           break
 
       if not smallest_type:
@@ -601,11 +1459,17 @@ unique values for it. This column will be labeled as a \
       # That's the type we'll put in the schema
       datatype = smallest_type
 
-    elif series.dtype.kind in ['f', 'c']: # pylint: disable=inconsistent-quotes
+    elif series.dtype.kind in _FLOAT_KINDS:
       # numpy dtypes will be `float32`/`float64`, but we just want `float`.
       datatype = "float"
-      min_value = series.min()
-      max_value = series.max()
+      # Unwrap the numpy scalars to plain Python floats, like the int
+      # branch does, so the schema output serializes as plain numbers
+      if min_max is not None:
+        min_value = float(min_max[0])
+        max_value = float(min_max[1])
+      else:
+        min_value = float(series.min())
+        max_value = float(series.max())
 
       if fuzz_min_max:
         # Given these min and max values, "fuzz" them a little bit
@@ -615,9 +1479,52 @@ unique values for it. This column will be labeled as a \
         max_value = max_value + padding_margin
 
     else:
-      # See if we can parse it as a date
+      # See if we can parse it as a date. Parsing dates is slow (each
+      # value may fall through to dateutil), so first probe a small
+      # sample; if the sample doesn't parse, the column is certainly not
+      # a date column and we can skip parsing the rest of it.
+      series_without_na = series.dropna()
+
+      # A plain string column whose first value contains no digits at
+      # all (pure freetext) can't be a date column, so don't even probe
+      # it; this skips the whole datetime machinery for text columns
+      if len(series_without_na) > 0 and \
+          pd.api.types.infer_dtype(series_without_na) == "string" and \
+          not any(char.isdigit() for char in str(series_without_na.iloc[0])):
+        return (datatype, min_value, max_value)
+
       try:
-        dt = pd.to_datetime(series)
+        # Try to sniff the date format from the first value; when the
+        # guess works, the full parse below runs through pandas' fast
+        # C strptime path instead of per-element dateutil inference
+        date_format = None
+        if len(series_without_na) > 0:
+          date_format = pd.tseries.api.guess_datetime_format(
+              str(series_without_na.iloc[0]))
+
+        try:
+          dt = pd.to_datetime(
+              series_without_na.iloc[:DATE_PROBE_SAMPLE_SIZE],
+              format=date_format)
+        except (ValueError, TypeError):
+          if date_format is None:
+            raise
+          # The guessed format didn't hold for the whole sample (e.g.
+          # mixed formats); fall back to per-element inference
+          date_format = None
+          dt = pd.to_datetime(
+              series_without_na.iloc[:DATE_PROBE_SAMPLE_SIZE])
+
+        # If the probe covered all the values, we already have the parsed
+        # result; otherwise parse the full series (once)
+        if len(series_without_na) > DATE_PROBE_SAMPLE_SIZE:
+          try:
+            dt = pd.to_datetime(series_without_na, format=date_format,
+                cache=True)
+          except (ValueError, TypeError):
+            if date_format is None:
+              raise
+            dt = pd.to_datetime(series_without_na, cache=True)
         datatype = "date"
       except: # Logging the full exception... pylint: disable=bare-except
         # Default to it just being a string
@@ -626,5 +1533,12 @@ unique values for it. This column will be labeled as a \
         # It's a date; get min/max as dates, rounded to the nearest day
         min_value = str(dt.min().floor("D"))
         max_value = str(dt.max().ceil("D"))
+        # Detecting the dates meant parsing them, so keep the parsed
+        # result around rather than throwing it away -- but only when we
+        # parsed the actual column (not a precomputed unique subset).
+        # Distinct columns write to distinct keys, so this is safe from
+        # the per-column worker threads.
+        if column is not None and unique_values is None:
+          self._parsed_dates[column] = dt
 
     return (datatype, min_value, max_value)
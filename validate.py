@@ -19,7 +19,7 @@ import argparse
 import pathlib
 import json
 import sys
-from jsonschema import validate
+from jsonschema import validators
 
 # These are the two schema files
 PARAMETERS_SCHEMA = pathlib.Path(__file__).parent.joinpath(
@@ -29,10 +29,34 @@ DATATYPES_SCHEMA = pathlib.Path(__file__).parent.joinpath(
     "json_schemae/column_datatypes.json.schema"
 )
 
-def validate_schema(input_file, is_parameters):
-  json_schema = None
+# Compiling a JSON schema into a validator is much more expensive than
+# actually running it, so keep the compiled validators cached per schema
+# file; repeated validations (e.g. batch runs) then skip the reload and
+# recompile entirely.
+_VALIDATORS = {}
+
+def _get_validator(schema_file):
+  """Return a compiled jsonschema validator for the given schema file,
+  loading and compiling it only the first time it's requested.
+  """
+  validator = _VALIDATORS.get(schema_file)
+  if validator is None:
+    with open(schema_file, encoding="utf-8") as f:
+      json_schema = json.load(f)
+    # Pick the validator class that matches the schema's declared draft
+    validator_class = validators.validator_for(json_schema)
+    validator_class.check_schema(json_schema)
+    validator = validator_class(json_schema)
+    _VALIDATORS[schema_file] = validator
+  return validator
+
+def validate_schema_obj(schema_object, is_parameters):
+  """Validate an in-memory schema dict (as returned by
+  SchemaGenerator.get_parameters_json / get_column_datatypes_json)
+  without any file round-trip.
+  """
   schema_file = None
-  # Read in the schema for the appropriate filetype
+  # Pick the schema for the appropriate filetype
   if is_parameters:
     schema_file = PARAMETERS_SCHEMA
   else:
@@ -41,14 +65,14 @@ def validate_schema(input_file, is_parameters):
     # any "else" is for the datatypes schema
     schema_file = DATATYPES_SCHEMA
 
-  # load in the schema and the file to validate
-  with open(schema_file, encoding="utf-8") as f:
-    json_schema = json.load(f)
+  _get_validator(schema_file).validate(schema_object)
 
+def validate_schema(input_file, is_parameters):
+  # load in the file to validate
   with open(input_file, encoding="utf-8") as f:
     file_to_validate = json.load(f)
 
-  validate(instance=file_to_validate, schema=json_schema)
+  validate_schema_obj(file_to_validate, is_parameters)
 
 if __name__ == "__main__":
   # validate.py executed as script